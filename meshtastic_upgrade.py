@@ -40,38 +40,305 @@ import argparse
 import json
 import os
 import re
-import shutil
 import stat
-import subprocess
 import sys
+import time
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List, Optional
-from urllib.request import urlopen, Request
+from typing import Callable, Dict, List, Optional, Tuple
 
 GITHUB_API = "https://api.github.com/repos/meshtastic/firmware"
 UA = "meshtastic-upgrade-script/1.4 (+https://github.com/meshtastic/firmware)"
 
 SUPPORTED_PLATFORMS = {"esp32", "esp32s3", "nrf52", "rp2040"}
 
-def http_json(url: str):
-    req = Request(url, headers={"User-Agent": UA, "Accept": "application/vnd.github+json"})
-    with urlopen(req) as r:
-        return json.load(r)
-
-def http_download(url: str, dest: Path, chunk: int = 1024 * 1024):
+_ASSET_RE_TMPL = r"^firmware-{plat}-.*\.zip$"
+_LOOSE_BIN_RE_TMPL = r"^firmware-{board}-.*-update\.bin$"
+
+@lru_cache(maxsize=32)
+def _asset_re(platform: str) -> "re.Pattern[str]":
+    return re.compile(_ASSET_RE_TMPL.format(plat=re.escape(platform)), re.IGNORECASE)
+
+@lru_cache(maxsize=32)
+def _loose_bin_re(board: str) -> "re.Pattern[str]":
+    return re.compile(_LOOSE_BIN_RE_TMPL.format(board=re.escape(board)), re.IGNORECASE)
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+@lru_cache(maxsize=None)
+def _stream_unzip():
+    # Optional and slow to import (pulls in asyncio); only loaded when a bundle is downloaded
+    try:
+        from stream_unzip import stream_unzip
+    except ImportError:  # fall back to stdlib zipfile
+        return None
+    return stream_unzip
+
+@lru_cache(maxsize=None)
+def _orjson_loads():
+    # Optional faster JSON parser; only loaded when GitHub metadata is actually parsed
+    try:
+        import orjson
+    except ImportError:  # fall back to stdlib json
+        return None
+    return orjson.loads
+
+def _json_loads(data: bytes):
+    loads = _orjson_loads()
+    return loads(data) if loads is not None else json.loads(data)
+
+def _write_atomic(path: Path, data: bytes):
+    # Write via a temp file in the same directory so readers never see a partial file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+def _read_json_cache(cache_file: Path):
+    # Cached body, or None if it is missing or unreadable (e.g., cut off by a crash)
+    try:
+        return _json_loads(cache_file.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+def http_json(url: str, cache_file: Optional[Path] = None):
+    # With cache_file, the body is kept on disk alongside <cache_file>.meta ({"etag", "expires"}):
+    # reuse it as-is within Cache-Control max-age, otherwise revalidate with If-None-Match.
+    # An unreadable cache is ignored and the URL fetched unconditionally.
+    headers = {"User-Agent": UA, "Accept": "application/vnd.github+json"}
+    meta = {}
+    cached = None
+    meta_file = cache_file.with_suffix(".meta") if cache_file is not None else None
+    if cache_file is not None and meta_file.exists():
+        try:
+            meta = json.loads(meta_file.read_text())
+        except (OSError, ValueError):
+            meta = {}
+        if isinstance(meta, dict) and meta:
+            cached = _read_json_cache(cache_file)
+        if cached is None:
+            meta = {}
+        elif meta.get("expires", 0) > time.time():
+            return cached
+        elif meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+    from urllib.error import HTTPError
+    from urllib.request import urlopen, Request
+    req = Request(url, headers=headers)
+    try:
+        with urlopen(req) as r:
+            data = r.read()
+            resp_headers = r.headers
+    except HTTPError as e:
+        if e.code != 304 or "If-None-Match" not in headers:
+            raise
+        data = None
+        resp_headers = e.headers
+    else:
+        if cache_file is not None:
+            _write_atomic(cache_file, data)
+    if cache_file is not None:
+        m = _MAX_AGE_RE.search(resp_headers.get("Cache-Control") or "")
+        meta = {
+            "etag": resp_headers.get("ETag") or meta.get("etag"),
+            "expires": time.time() + int(m.group(1)) if m else 0,
+        }
+        _write_atomic(meta_file, json.dumps(meta).encode())
+    return cached if data is None else _json_loads(data)
+
+class HashingReader:
+    # File-like wrapper that feeds everything read through it into a SHA-256
+    def __init__(self, fp):
+        import hashlib
+        self.fp = fp
+        self.sha256 = hashlib.sha256()
+
+    def read(self, n: int = -1) -> bytes:
+        b = self.fp.read(n)
+        self.sha256.update(b)
+        return b
+
+def _sha256_sidecar(path: Path) -> Path:
+    return path.with_name(path.name + ".sha256")
+
+def file_sha256(path: Path) -> str:
+    import hashlib
+    import mmap
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()  # mmap cannot map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.sha256(mm).hexdigest()
+
+def http_download(url: str, dest: Path, expected_sha256: Optional[str] = None,
+                  expected_size: Optional[int] = None, chunk: int = 8 * 1024 * 1024) -> str:
+    # Downloads to <dest>.part, hashing while writing. Only if the size / SHA-256 match (when
+    # given) is it renamed into place and the digest recorded in <dest>.sha256 (sha256sum
+    # format); otherwise, or on any error, .part is removed. Returns the hex digest.
+    import shutil
+    from urllib.request import urlopen, Request
     dest.parent.mkdir(parents=True, exist_ok=True)
-    req = Request(url, headers={"User-Agent": UA})
-    with urlopen(req) as r, open(dest, "wb") as f:
-        while True:
-            b = r.read(chunk)
-            if not b:
-                break
-            f.write(b)
-
-def find_release(previous: bool, alpha: bool, tag: Optional[str] = None) -> Dict:
+    part = dest.with_name(dest.name + ".part")
+    # The bundle is already compressed; ask for it as-is
+    req = Request(url, headers={"User-Agent": UA, "Accept-Encoding": "identity"})
+    try:
+        with urlopen(req) as r, open(part, "wb") as f:
+            reader = HashingReader(r)
+            shutil.copyfileobj(reader, f, length=chunk)
+        size = part.stat().st_size
+        if expected_size is not None and size != expected_size:
+            raise SystemExit(f"Download of {url} is incomplete: got {size} bytes, expected {expected_size}.")
+        digest = reader.sha256.hexdigest()
+        if expected_sha256 and digest != expected_sha256.lower():
+            raise SystemExit(f"SHA-256 mismatch for {url}: got {digest}, expected {expected_sha256}.")
+        os.replace(part, dest)
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+    _sha256_sidecar(dest).write_text(f"{digest}  {dest.name}\n")
+    return digest
+
+def verify_cached_zip(zip_path: Path, expected_sha256: Optional[str] = None,
+                      expected_size: Optional[int] = None) -> bool:
+    # Checks the size (when known) and the SHA-256 against expected_sha256, else against the
+    # <zip>.sha256 recorded at download. A cached zip with neither is accepted as-is.
+    if expected_size is not None and zip_path.stat().st_size != expected_size:
+        return False
+    if expected_sha256 is None:
+        try:
+            expected_sha256 = _sha256_sidecar(zip_path).read_text().split()[0]
+        except (OSError, IndexError):
+            return True
+    return file_sha256(zip_path) == expected_sha256.lower()
+
+def asset_sha256(asset: Dict) -> Optional[str]:
+    # GitHub publishes asset digests as "sha256:<hex>" (absent on older releases)
+    digest = asset.get("digest") or ""
+    return digest[len("sha256:"):] if digest.startswith("sha256:") else None
+
+def http_download_extract(url: str, outdir: Path, keep: Optional[Callable[[str], bool]] = None,
+                          expected_sha256: Optional[str] = None, expected_size: Optional[int] = None,
+                          chunk: int = 1024 * 1024):
+    # Decompress the bundle as it arrives (requires stream-unzip); no zip is written to disk.
+    # If `keep` is given, only entries whose name it accepts are written; the rest are discarded.
+    # Entries go to <outdir>.part, which replaces outdir only once the whole bundle was read and
+    # its compressed bytes match expected_size / expected_sha256 (when given), so an interrupted
+    # or corrupt download never leaves an outdir behind.
+    import hashlib
+    import shutil
+    from urllib.request import urlopen, Request
+    stream_unzip = _stream_unzip()
+    part = outdir.with_name(outdir.name + ".part")
+    shutil.rmtree(part, ignore_errors=True)  # leftover from a killed run
+    part.mkdir(parents=True)
+    root = part.resolve()
+    req = Request(url, headers={"User-Agent": UA, "Accept-Encoding": "identity"})
+    sha256 = hashlib.sha256()
+    received = 0
+    try:
+        with urlopen(req) as r:
+            def chunks():
+                nonlocal received
+                while True:
+                    b = r.read(chunk)
+                    if not b:
+                        break
+                    sha256.update(b)
+                    received += len(b)
+                    yield b
+            for name, _size, unzipped_chunks in stream_unzip(chunks()):
+                name = name.decode("utf-8", errors="replace")
+                if keep is not None and not keep(name):
+                    for _ in unzipped_chunks:  # each entry must be drained before the next
+                        pass
+                    continue
+                dest = (root / name).resolve()
+                if dest != root and root not in dest.parents:
+                    raise SystemExit(f"Refusing to extract unsafe path from bundle: {name}")
+                if name.endswith("/") or dest == root:
+                    dest.mkdir(parents=True, exist_ok=True)
+                    for _ in unzipped_chunks:  # each entry must be drained before the next
+                        pass
+                    continue
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                with open(dest, "wb") as f:
+                    for b in unzipped_chunks:
+                        f.write(b)
+            for _ in chunks():  # hash any trailing bytes stream_unzip did not consume
+                pass
+        if expected_size is not None and received != expected_size:
+            raise SystemExit(f"Download of {url} is incomplete: got {received} bytes, expected {expected_size}.")
+        digest = sha256.hexdigest()
+        if expected_sha256 and digest != expected_sha256.lower():
+            raise SystemExit(f"SHA-256 mismatch for {url}: got {digest}, expected {expected_sha256}.")
+        os.replace(part, outdir)
+    except BaseException:
+        shutil.rmtree(part, ignore_errors=True)
+        raise
+
+def extract_zip(zip_path: Path, outdir: Path, keep: Optional[Callable[[str], bool]] = None):
+    # Like http_download_extract, but from a ZIP on disk: extract via <outdir>.part, then rename.
+    import shutil
+    import zipfile
+    part = outdir.with_name(outdir.name + ".part")
+    shutil.rmtree(part, ignore_errors=True)  # leftover from a killed run
+    part.mkdir(parents=True)
+    try:
+        with zipfile.ZipFile(zip_path, "r") as zf:
+            if keep is None:
+                zf.extractall(part)
+            else:
+                for info in zf.infolist():
+                    if keep(info.filename):
+                        zf.extract(info, part)
+        os.replace(part, outdir)
+    except BaseException:
+        shutil.rmtree(part, ignore_errors=True)
+        raise
+
+def fetch_bundle(asset: Dict, zip_path: Path, outdir: Path, keep: Optional[Callable[[str], bool]] = None,
+                 keep_zip: bool = False, verbose: bool = False):
+    # Extracts the bundle (only the entries `keep` accepts, if given) into outdir. Reuses and
+    # verifies a cached ZIP; otherwise streams it when stream-unzip is available and the ZIP
+    # need not be kept, else downloads the ZIP first.
+    asset_url = asset.get("browser_download_url")
+    expected_sha256 = asset_sha256(asset)
+    if not zip_path.exists() and not keep_zip and _stream_unzip() is not None:
+        # Single pass: decompress while downloading, no intermediate zip
+        if verbose: print(f"Downloading and extracting {asset_url} to {outdir} ...")
+        http_download_extract(asset_url, outdir, keep=keep, expected_sha256=expected_sha256,
+                              expected_size=asset.get("size"))
+        return
+    if zip_path.exists():
+        if verbose: print(f"Verifying cached {zip_path} ...")
+        if verify_cached_zip(zip_path, expected_sha256, asset.get("size")):
+            if verbose: print(f"Using cached {zip_path}")
+        else:
+            print(f"Cached {zip_path.name} is incomplete or corrupt; downloading again.", file=sys.stderr)
+            zip_path.unlink()
+            _sha256_sidecar(zip_path).unlink(missing_ok=True)
+    if not zip_path.exists():
+        if verbose: print(f"Downloading {asset_url} ...")
+        http_download(asset_url, zip_path, expected_sha256=expected_sha256,
+                      expected_size=asset.get("size"))
+    if verbose: print(f"Extracting to {outdir} ...")
+    extract_zip(zip_path, outdir, keep=keep)
+
+def find_release(previous: bool, alpha: bool, tag: Optional[str] = None,
+                 cache_dir: Optional[Path] = None) -> Dict:
+    def cached(name: str) -> Optional[Path]:
+        return cache_dir / f"{name}.json" if cache_dir is not None else None
     if tag:
-        return http_json(f"{GITHUB_API}/releases/tags/{tag}")
-    releases = http_json(f"{GITHUB_API}/releases?per_page=100")
+        return http_json(f"{GITHUB_API}/releases/tags/{tag}", cached("release-" + tag.replace("/", "_")))
+    if not alpha and not previous:
+        # Common case: GitHub resolves the latest stable (non-prerelease, non-draft) release itself
+        return http_json(f"{GITHUB_API}/releases/latest", cached("release-latest"))
+    releases = http_json(f"{GITHUB_API}/releases?per_page=100", cached("releases"))
     if alpha:
         candidates = [r for r in releases if r.get("prerelease") and not r.get("draft")]
     else:
@@ -86,17 +353,40 @@ def find_release(previous: bool, alpha: bool, tag: Optional[str] = None) -> Dict
 
 def pick_asset_for_platform(release: Dict, platform: str) -> Dict:
     assets = release.get("assets", [])
-    pat = re.compile(rf"^firmware-{re.escape(platform)}-.*\.zip$", re.IGNORECASE)
-    matches = [a for a in assets if pat.match(a.get("name",""))]
+    match = _asset_re(platform).match
+    matches = [a for a in assets if match(a.get("name",""))]
     if not matches:
         raise SystemExit(f"No firmware bundle found for platform '{platform}' in release {release.get('tag_name')}")
     matches.sort(key=lambda a: a.get("size", 0), reverse=True)  # prefer largest
     return matches[0]
 
-def ensure_esptool_in_path() -> Optional[str]:
+ESPTOOL_CACHE_TTL = 24 * 60 * 60
+
+def ensure_esptool_in_path(cache_dir: Optional[Path] = None) -> Optional[str]:
+    # With cache_dir, remember the lookup in esptool_path.json for ESPTOOL_CACHE_TTL seconds;
+    # it is reused only while PATH is unchanged and the binary's mtime still matches.
+    cache_file = cache_dir / "esptool_path.json" if cache_dir is not None else None
+    search_path = os.environ.get("PATH", "")
+    if cache_file is not None:
+        try:
+            cached = json.loads(cache_file.read_text())
+            if (cached.get("PATH") == search_path
+                    and time.time() - cached.get("checked", 0) < ESPTOOL_CACHE_TTL
+                    and os.stat(cached["path"]).st_mtime == cached.get("mtime")):
+                return cached["path"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    import shutil
     for name in ("esptool.py", "esptool"):
         p = shutil.which(name)
         if p:
+            if cache_file is not None:
+                try:
+                    cache_file.parent.mkdir(parents=True, exist_ok=True)
+                    cache_file.write_text(json.dumps({"path": p, "mtime": os.stat(p).st_mtime,
+                                                      "checked": time.time(), "PATH": search_path}))
+                except OSError:
+                    pass
             return p
     return None
 
@@ -104,49 +394,135 @@ def chmod_plus_x(path: Path):
     mode = path.stat().st_mode
     path.chmod(mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
 
-def find_device_update_sh(extract_dir: Path) -> Path:
-    candidate = extract_dir / "device-update.sh"
-    if candidate.exists():
-        return candidate
-    for p in extract_dir.rglob("device-update.sh"):
-        return p
-    raise SystemExit("device-update.sh not found in extracted firmware bundle.")
-
-def list_update_bins(extract_dir: Path) -> List[Path]:
-    bins = sorted(extract_dir.rglob("*-update.bin"))
-    if not bins:
-        raise SystemExit("No '*-update.bin' images were found inside the firmware bundle.")
-    return bins
+def _scan_bundle(extract_dir: Path) -> Tuple[Optional[os.DirEntry], List[Path]]:
+    # One scandir pass collecting device-update.sh (as its DirEntry, so callers can reuse its
+    # cached stat) and all *-update.bin images (unsorted; only the interactive listing needs order).
+    # The top-level directory is scanned before any subdirectory, so a top-level script wins.
+    script = None
+    bins = []
+    stack = [str(extract_dir)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith("-update.bin"):
+                    bins.append(Path(entry.path))
+                elif script is None and entry.name == "device-update.sh":
+                    script = entry
+    return script, bins
+
+def board_bundle_filter(board: str) -> Callable[[str], bool]:
+    # Accepts the bundle entries needed to flash `board`: device-update.sh and its update image(s)
+    loose = _loose_bin_re(board).match
+    def keep(name: str) -> bool:
+        base = name.rsplit("/", 1)[-1]
+        return base == "device-update.sh" or loose(base) is not None
+    return keep
+
+def _index_images(images: List[Path], tag_name: str) -> Dict[str, Path]:
+    # Map board slug -> image, parsing firmware-<board>-<version>-update.bin once per file.
+    # The version is the tag version when the name carries it, else the last '-' segment.
+    # An image carrying the tag version wins; a slug left with several candidates is omitted
+    # so the interactive prompt handles it.
+    version = (tag_name or "").lstrip("v").lower()
+    exact: Dict[str, Path] = {}
+    loose: Dict[str, List[Path]] = {}
+    for p in images:
+        name = p.name.lower()
+        if not (name.startswith("firmware-") and name.endswith("-update.bin")):
+            continue
+        stem = name[len("firmware-"):-len("-update.bin")]
+        if version and stem.endswith("-" + version):
+            exact.setdefault(stem[:-len(version) - 1], p)
+        else:
+            slug = stem.rpartition("-")[0]
+            if slug:
+                loose.setdefault(slug, []).append(p)
+    index = {slug: paths[0] for slug, paths in loose.items() if len(paths) == 1}
+    index.update(exact)
+    return index
 
 def resolve_board_image(images: List[Path], board: str, tag_name: str) -> Optional[Path]:
-    # Try strict match with tag version first: firmware-<board>-<version>-update.bin
-    version = (tag_name or "").lstrip("v")
-    strict = re.compile(rf"^firmware-{re.escape(board)}-{re.escape(version)}-update\.bin$", re.IGNORECASE) if version else None
-    if strict:
-        for p in images:
-            if strict.match(p.name):
-                return p
-    # Fallback: any update bin that starts with firmware-<board>- and ends with -update.bin
-    loose = re.compile(rf"^firmware-{re.escape(board)}-.*-update\.bin$", re.IGNORECASE)
-    candidates = [p for p in images if loose.match(p.name)]
-    if len(candidates) == 1:
-        return candidates[0]
-    if len(candidates) > 1:
-        # If multiple (unusual within a single bundle), prefer one containing the version string if present
-        if version:
-            for p in candidates:
-                if version in p.name:
-                    return p
-        # otherwise return None and let interactive prompt handle it
+    return _index_images(images, tag_name).get(board.lower())
+
+_WIN_COM_RE = re.compile(r"^(\\\\\.\\)?COM\d+$", re.IGNORECASE)
+
+def port_present(port: str) -> bool:
+    # False only for a local device path that does not exist (yet): native-USB boards often
+    # show up only after being replugged in BOOT mode.
+    return "://" in port or os.name == "nt" or os.path.exists(port)
+
+def validate_port(port: str) -> Optional[str]:
+    # Returns an error message if `port` clearly is not a usable serial device, else None.
+    if "://" in port:
+        return None  # pyserial URL (rfc2217://, socket://) handled by esptool itself
+    if os.name == "nt":
+        return None if _WIN_COM_RE.match(port) else f"'{port}' is not a COM port (e.g., COM3)."
+    try:
+        st = os.stat(port)
+    except OSError as e:
+        return f"Serial port '{port}' is not accessible: {e.strerror}."
+    if not stat.S_ISCHR(st.st_mode):
+        return f"'{port}' is not a character device."
+    if sys.platform.startswith("linux") and os.path.isdir("/sys/class/tty"):
+        name = os.path.basename(os.path.realpath(port))
+        if not os.path.exists(f"/sys/class/tty/{name}"):
+            return f"'{port}' is not a tty device."
     return None
 
-def run(cmd: List[str], env: dict, dry_run: bool, verbose: bool) -> int:
+# esptool output that means the flash cannot succeed; stop instead of waiting out retries
+_FATAL_LINE_RE = re.compile(rb"^\s*A fatal error occurred:")
+_LINE_SPLIT_RE = re.compile(rb"[\r\n]")
+
+def run(cmd: List[str], env: dict, dry_run: bool, verbose: bool, quiet: bool = False,
+        fail_fast: bool = True) -> int:
     if verbose or dry_run:
         print("+", " ".join(cmd))
     if dry_run:
         return 0
-    proc = subprocess.run(cmd, env=env, check=False)
-    return proc.returncode
+    import subprocess
+    # Output is forwarded in raw chunks (keeps esptool's \r progress bars live). With fail_fast,
+    # it is also scanned line by line: the first fatal error stops the script and fails the step.
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+    fatal_seen = False
+    pending = b""
+
+    def scan(lines: List[bytes]):
+        nonlocal fatal_seen
+        for line in lines:
+            if _FATAL_LINE_RE.match(line):
+                fatal_seen = True
+                if quiet:  # quiet still shows why a step failed
+                    out.write(line + b"\n")
+                    out.flush()
+                if fail_fast:
+                    return
+
+    proc = subprocess.Popen(cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    with proc.stdout:
+        while True:
+            b = proc.stdout.read1(64 * 1024)
+            if not b:
+                if pending and (fail_fast or quiet):
+                    scan([pending])  # last line without a trailing newline
+                break
+            if not quiet:
+                out.write(b)
+                out.flush()
+            if not (fail_fast or quiet):
+                continue
+            *lines, pending = _LINE_SPLIT_RE.split(pending + b)
+            scan(lines)
+            if fail_fast and fatal_seen:
+                # Stop reading too: a leftover grandchild could keep the pipe open
+                proc.terminate()
+                break
+    rc = proc.wait()
+    if fail_fast and fatal_seen and rc <= 0:
+        rc = 1  # stopped by us (negative), or the script exited 0 despite the error
+    return rc
 
 def main():
     parser = argparse.ArgumentParser(
@@ -164,9 +540,12 @@ def main():
     parser.add_argument("--tag", help="Override and use a specific release tag, e.g., v2.7.11.ee68575")
     parser.add_argument("--output-dir", default="./.meshtastic_firmware_cache",
                         help="Where to download/extract the firmware bundle.")
+    parser.add_argument("--keep-zip", action="store_true",
+                        help="Keep the downloaded bundle ZIP in the cache (always the case without stream-unzip installed).")
     parser.add_argument("--dry-run", action="store_true", help="Print actions without executing flashing steps.")
     parser.add_argument("--yes", action="store_true", help="Do not prompt before flashing (still prompts to select image if --board not used).")
     parser.add_argument("--verbose", action="store_true", help="Verbose logging.")
+    parser.add_argument("--quiet", action="store_true", help="Hide device-update.sh/esptool output except fatal errors.")
     args = parser.parse_args()
 
     platform = args.firmware.lower()
@@ -179,9 +558,23 @@ def main():
         print("ERROR: ESPTOOL_PORT is not set. Use --port or set the env var.", file=sys.stderr)
         print("  e.g., --port /dev/ttyACM0  or  export ESPTOOL_PORT=/dev/ttyACM0", file=sys.stderr)
         sys.exit(2)
+    # Catch wrong paths before any download work; a dry run only warns.
+    # A port that does not exist yet is checked again right before flashing.
+    port_missing = not port_present(esptool_port)
+    if port_missing:
+        print(f"WARNING: Serial port '{esptool_port}' does not exist yet; it is checked again before flashing "
+              "(e.g., after replugging the board in BOOT mode).", file=sys.stderr)
+    else:
+        port_error = validate_port(esptool_port)
+        if port_error:
+            if not args.dry_run:
+                print(f"ERROR: {port_error} Check --port / ESPTOOL_PORT.", file=sys.stderr)
+                sys.exit(2)
+            print(f"WARNING: {port_error}", file=sys.stderr)
 
     # esptool presence
-    esptool_path = ensure_esptool_in_path()
+    cache_root = Path(args.output_dir).resolve()
+    esptool_path = ensure_esptool_in_path(cache_root)
     if not esptool_path:
         print("ERROR: 'esptool.py' (or 'esptool') was not found in your PATH.", file=sys.stderr)
         print("Install with pipx (recommended):", file=sys.stderr)
@@ -191,16 +584,21 @@ def main():
         sys.exit(3)
 
     # Find release
-    release = find_release(previous=args.previous, alpha=args.alpha, tag=args.tag)
+    release = find_release(previous=args.previous, alpha=args.alpha, tag=args.tag,
+                           cache_dir=cache_root)
     tag_name = release.get("tag_name")
     prerelease = release.get("prerelease", False)
     channel = "Alpha" if prerelease else "Stable"
     asset = pick_asset_for_platform(release, platform)
     asset_name = asset.get("name")
-    asset_url = asset.get("browser_download_url")
 
-    outdir = Path(args.output_dir).resolve() / asset_name.replace(".zip","")
-    zip_path = outdir.with_suffix(".zip")
+    board = args.board.strip() if args.board else None
+    if board and ("/" in board or "\\" in board or board in (".", "..")):
+        raise SystemExit(f"Invalid --board '{board}': a board slug cannot contain path separators.")
+    outdir = cache_root / asset_name.replace(".zip","")
+    zip_path = cache_root / asset_name
+    # Partial extraction holding only the --board files, kept apart from the full bundle
+    board_dir = outdir.with_name(f"{outdir.name}.{board.lower()}") if board else None
 
     if args.verbose:
         print(f"Selected release: {tag_name} [{channel}] (previous={args.previous})")
@@ -208,41 +606,51 @@ def main():
         print(f"Download to: {zip_path}")
         print(f"Extract to: {outdir}")
 
-    # Download
-    if not zip_path.exists():
-        if args.verbose: print(f"Downloading {asset_url} ...")
-        http_download(asset_url, zip_path)
-    else:
-        if args.verbose: print(f"Using cached {zip_path}")
-
-    # Extract
-    if not outdir.exists():
-        if args.verbose: print(f"Extracting to {outdir} ...")
-        outdir.mkdir(parents=True, exist_ok=True)
-        import zipfile
-        with zipfile.ZipFile(zip_path, "r") as zf:
-            zf.extractall(outdir)
-    else:
+    # Download & extract
+    bundle_dir = outdir
+    if outdir.exists():
+        if args.verbose: print(f"Using existing extracted directory {outdir}")
+    elif board_dir is not None and board_dir.exists():
+        outdir = board_dir
         if args.verbose: print(f"Using existing extracted directory {outdir}")
+    elif board:
+        # With --board only the files needed for that board are extracted
+        outdir = board_dir
+        fetch_bundle(asset, zip_path, outdir, keep=board_bundle_filter(board),
+                     keep_zip=args.keep_zip, verbose=args.verbose)
+    else:
+        fetch_bundle(asset, zip_path, outdir, keep_zip=args.keep_zip, verbose=args.verbose)
 
     # Locate script & images
-    device_update = find_device_update_sh(outdir)
-    mode = device_update.stat().st_mode
-    if not (mode & stat.S_IXUSR):
-        device_update.chmod(mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
-
-    images = list_update_bins(outdir)
+    script_entry, images = _scan_bundle(outdir)
+    if not images and outdir == board_dir:
+        # Nothing matched --board: fall back to the full bundle and the interactive prompt
+        import shutil
+        shutil.rmtree(outdir, ignore_errors=True)
+        print(f"No image for board '{board}' in {asset_name}; extracting the full bundle.", file=sys.stderr)
+        outdir = bundle_dir
+        fetch_bundle(asset, zip_path, outdir, keep_zip=args.keep_zip, verbose=args.verbose)
+        script_entry, images = _scan_bundle(outdir)
+    if script_entry is None:
+        raise SystemExit("device-update.sh not found in extracted firmware bundle.")
+    device_update = Path(script_entry.path)
+    if not images:
+        raise SystemExit("No '*-update.bin' images were found inside the firmware bundle.")
+    st_mode = script_entry.stat().st_mode
+    if not (st_mode & stat.S_IXUSR):
+        os.chmod(script_entry.path, st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
 
     chosen_path = None
-    if args.board:
-        chosen_path = resolve_board_image(images, args.board.strip(), tag_name or "")
+    if board:
+        chosen_path = resolve_board_image(images, board, tag_name or "")
         if chosen_path is None:
             print(f"Could not automatically find image for board '{args.board}'.", file=sys.stderr)
 
     if chosen_path is None:
-        print("\nAvailable update binaries in this bundle:\n")
-        for i, p in enumerate(images, 1):
-            print(f"  {i:2d}. {p.name}")
+        images.sort(key=attrgetter("name"))
+        # One write for the whole listing; per-line prints are slow on high-latency terminals
+        listing = "\n".join(f"  {i:2d}. {p.name}" for i, p in enumerate(images, 1))
+        sys.stdout.write(f"\nAvailable update binaries in this bundle:\n\n{listing}\n")
         # Prompt for exact filename
         while True:
             user_in = input("\nEnter the EXACT filename to flash (copy/paste from list): ").strip()
@@ -255,25 +663,39 @@ def main():
                 break
             print("No exact match. Please copy/paste the filename exactly as shown.")
 
-    print(f"\nReady to flash Meshtastic {tag_name} [{channel}] for platform {platform}.")
-    print(f"- Bundle: {asset_name}")
-    print(f"- Script: {device_update}")
-    print(f"- Image : {chosen_path.name}")
-    print(f"- Port  : {esptool_port}\n")
+    sys.stdout.write(
+        f"\nReady to flash Meshtastic {tag_name} [{channel}] for platform {platform}.\n"
+        f"- Bundle: {asset_name}\n"
+        f"- Script: {device_update}\n"
+        f"- Image : {chosen_path.name}\n"
+        f"- Port  : {esptool_port}\n\n"
+    )
 
     if not args.yes:
-        print(">>> ACTION REQUIRED: Put your device in BOOT/Download mode if needed.")
-        print("For some boards (t3s3, etc), you may need to hold the BOOT (or 0) button while powering on.")
+        sys.stdout.write(
+            ">>> ACTION REQUIRED: Put your device in BOOT/Download mode if needed.\n"
+            "For some boards (t3s3, etc), you may need to hold the BOOT (or 0) button while powering on.\n"
+        )
         input("Press Enter to continue when the device is ready...")
 
+    if port_missing:
+        port_error = validate_port(esptool_port)
+        if port_error:
+            if not args.dry_run:
+                print(f"ERROR: {port_error} Check the connection and --port / ESPTOOL_PORT.", file=sys.stderr)
+                sys.exit(2)
+            print(f"WARNING: {port_error}", file=sys.stderr)
+
     env = os.environ.copy()
     env["ESPTOOL_PORT"] = esptool_port
 
     # Optional Step 1: change mode
     if args.change_mode:
         print("Step 1/2: Preparing flash (change mode)...")
+        # esptool's 1200bps touch normally ends in "A fatal error occurred: ... No serial data
+        # received" while the board reboots, so only the exit code decides this step
         rc1 = run([str(device_update), "-f", str(chosen_path), "--change-mode"],
-                  env=env, dry_run=args.dry_run, verbose=args.verbose)
+                  env=env, dry_run=args.dry_run, verbose=args.verbose, quiet=args.quiet, fail_fast=False)
         if rc1 != 0:
             print(f"❌ change-mode step failed with exit code {rc1}. Aborting.", file=sys.stderr)
             sys.exit(rc1)
@@ -284,7 +706,7 @@ def main():
     # Step 2: actual flash (only if prior steps succeeded)
     print("Step 2/2: Flashing firmware...")
     rc2 = run([str(device_update), "-f", str(chosen_path)],
-              env=env, dry_run=args.dry_run, verbose=args.verbose)
+              env=env, dry_run=args.dry_run, verbose=args.verbose, quiet=args.quiet)
 
     if rc2 == 0:
         print("✅ Flash completed successfully.")